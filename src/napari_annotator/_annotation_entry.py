@@ -25,10 +25,11 @@ class LabelItem:
         # assign color dictionary
         self.color_dict = color_dictionary
         self.active = False  # state if it is selected for drawing
-        self.visible = True  # shown in the viewer or not
         self.color = self.color_dict[
             self.label
         ]  # this variable is never really used...
+        # shown in the viewer or not (hidden labels have alpha = 0)
+        self.visible = bool(self.color[3] > 0)
         self.mem = None  # for remembering drawn pixels after erasing
         # (array with len axis = image len axis)
 
@@ -1,4 +1,5 @@
 import napari
+import numpy as np
 from napari.utils.colormaps import (
     DirectLabelColormap,
     label_colormap,
@@ -10,6 +11,79 @@ from napari_annotator._annotation_entry import LabelItem
 
 # maximum labels for the list
 _maxLabels = 20000
+# maximum label value for which compaction uses a direct lookup table
+_maxLutSize = 2**24
+
+
+def _compact_dtype(n_labels, dtype):
+    """
+    Helper function
+    Choose the unsigned dtype for compacted labels data.
+    Keeps room for up to _maxLabels labels (i.e. uint16),
+    unless the given dtype is smaller and the unsigned dtype
+    of the same size can hold n_labels + 1 (e.g. int8 -> uint8).
+    :param n_labels: number of labels after compaction
+    :param dtype: dtype of the original labels data
+    :return: numpy dtype
+    """
+    compact_dtype = np.min_scalar_type(max(n_labels + 1, _maxLabels))
+    dtype = np.dtype(dtype)
+    if dtype.itemsize < compact_dtype.itemsize:
+        same_size_dtype = np.dtype(f"u{dtype.itemsize}")
+        if np.iinfo(same_size_dtype).max >= n_labels + 1:
+            return same_size_dtype
+    return compact_dtype
+
+
+def _format_bytes(n_bytes):
+    """
+    Helper function
+    Format a number of bytes as KB or MB.
+    :param n_bytes: number of bytes
+    :return: String, e.g.: '1.5 MB'
+    """
+    if abs(n_bytes) < 1024**2:
+        return f"{n_bytes / 1024:.1f} KB"
+    return f"{n_bytes / 1024**2:.1f} MB"
+
+
+def compact_label_data(data):
+    """
+    Relabels the present (non-zero) labels to a dense 1..N range,
+    keeping their order, and downcasts to an unsigned dtype with room
+    for up to _maxLabels labels (see _compact_dtype).
+    Background (0) stays 0.
+    :param data: numpy array of integer labels
+    :return: compacted data, dictionary {old label: new label}
+    """
+    data = np.asarray(data)
+    if data.size == 0:
+        return data.astype(_compact_dtype(0, data.dtype)), {}
+    min_label = int(data.min())
+    max_label = int(data.max())
+    if min_label >= 0 and max_label < _maxLutSize:
+        # mark present labels without sorting the whole array
+        present = np.zeros(max_label + 1, dtype=bool)
+        present[data] = True
+        present[0] = False
+        old_labels = np.flatnonzero(present)
+        dtype = _compact_dtype(len(old_labels), data.dtype)
+        lut = np.zeros(max_label + 1, dtype=dtype)
+        lut[old_labels] = np.arange(1, len(old_labels) + 1, dtype=dtype)
+        compacted = lut[data]
+    else:
+        # sparse or negative labels, remap via the inverse of np.unique
+        unique, inverse = np.unique(data, return_inverse=True)
+        is_label = unique != 0
+        old_labels = unique[is_label]
+        dtype = _compact_dtype(len(old_labels), data.dtype)
+        lut = np.zeros(len(unique), dtype=dtype)
+        lut[is_label] = np.arange(1, len(old_labels) + 1, dtype=dtype)
+        compacted = lut[inverse].reshape(data.shape)
+    mapping = {
+        int(old): new for new, old in enumerate(old_labels.tolist(), start=1)
+    }
+    return compacted, mapping
 
 
 class AnnoList(QWidget):
@@ -49,6 +123,7 @@ class AnnoList(QWidget):
 
         # create a LUT color dictionary
         colormap = label_colormap(num_colors=_maxLabels)
+        self.default_colors = colormap.colors
         self.color_dict = dict(
             enumerate(colormap.colors[1:_maxLabels], start=1)
         )
@@ -160,6 +235,65 @@ class AnnoList(QWidget):
                 entry.set_color_dictionary(self.color_dict)
                 self.label_items_array.append(entry)
 
+    # relabel to a dense range and downcast the labels layer data
+    def compact_labels(self):
+        """
+        Relabels the labels layer to a dense 1..N range and downcasts
+        the data to an unsigned dtype with room for up to _maxLabels labels.
+        Colors and visibility of the labels are carried over,
+        labels without a plugin color and freed label entries
+        get their default color.
+        Restoring erased labels is lost after compaction.
+        :return: number of bytes saved
+        """
+        if self.labelLayer is None:
+            return 0
+        old_data = self.labelLayer.data
+        old_nbytes = old_data.nbytes
+        new_data, mapping = compact_label_data(old_data)
+
+        # carry over the colors (from a copy, since negative labels
+        # can move positive labels to a higher label)
+        old_colors = {
+            old: np.array(self.color_dict[old])
+            for old in mapping
+            if 0 < old < _maxLabels
+        }
+        for old, new in mapping.items():
+            if new >= _maxLabels:
+                break
+            if old in old_colors:
+                self.color_dict[new] = old_colors[old]
+            else:
+                self.color_dict[new] = np.array(self.default_colors[new])
+        # reset the colors of the freed label entries
+        for i in range(len(mapping) + 1, len(self.label_items_array) + 1):
+            if i < _maxLabels:
+                self.color_dict[i] = np.array(self.default_colors[i])
+        self.colormap = DirectLabelColormap(color_dict=self.color_dict)
+        self.color_dict = self.colormap.color_dict
+
+        selected = self.labelLayer.selected_label
+        self.labelLayer.data = new_data
+        if selected in mapping:
+            self.labelLayer.selected_label = mapping[selected]
+        elif selected != 0:
+            # the next unused label
+            self.labelLayer.selected_label = len(mapping) + 1
+
+        # re-create the label entries
+        self.remove_widget_entries()
+        self.initialise_widget(self.labelLayer)
+
+        saved = old_nbytes - new_data.nbytes
+        print(
+            f"Compacted {len(mapping)} labels "
+            f"({old_data.dtype} -> {new_data.dtype}, "
+            f"max. label {np.iinfo(new_data.dtype).max}), "
+            f"saved {_format_bytes(saved)}."
+        )
+        return saved
+
     # initialise widget
     def initialise_widget(self, layer):
         """
@@ -1,7 +1,13 @@
 import napari
 from napari_plugin_engine import napari_hook_implementation
 from qtpy.QtCore import Qt
-from qtpy.QtWidgets import QLabel, QScrollArea, QVBoxLayout, QWidget
+from qtpy.QtWidgets import (
+    QLabel,
+    QPushButton,
+    QScrollArea,
+    QVBoxLayout,
+    QWidget,
+)
 
 from napari_annotator._annotations_list_widget import AnnoList
 
@@ -26,12 +32,20 @@ class Annotator(QWidget):
         self.widget_label_main = AnnoList(
             self.selected_Layer
         )  # create this object anyway for initialisation
+        self.qCompact = QPushButton("Compact labels")
+        self.qCompact.setToolTip(
+            "Relabel to a dense range of labels "
+            "and reduce the memory of the layer.\n"
+            "Large data types are reduced to uint16 "
+            "(max. label 65535)."
+        )
 
         #                   layout              #
         # create default layout and
         # add text info for current selected labels layer
         self.setLayout(QVBoxLayout())
         self.layout().addWidget(self.info)
+        self.layout().addWidget(self.qCompact)
 
         # get the header of the label items (to be) and add it into the layout
         self.layout().addWidget(self.widget_label_main.header)
@@ -45,6 +59,8 @@ class Annotator(QWidget):
         self.layout().addWidget(scroll)
 
         #                   "Action listeners"              #
+        self.qCompact.clicked.connect(self._onClick_compact_labels)
+
         # autodetect change in layer selection
         # and update the class variables
         @self.viewer.layers.selection.events.connect
@@ -124,6 +140,16 @@ class Annotator(QWidget):
         # mark/select the currently selected label
         self.widget_label_main.get_selected_label()
 
+    def _onClick_compact_labels(self):
+        """
+        Compacts the labels of the current labels layer
+        (used for the compact labels button)
+        :return:
+        """
+        if self.selected_Layer is None:
+            return
+        self.widget_label_main.compact_labels()
+
 
 @napari_hook_implementation
 def napari_experimental_provide_dock_widget():
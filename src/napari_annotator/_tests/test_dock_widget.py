@@ -1,4 +1,5 @@
 from napari_annotator import Annotator
+from napari_annotator._annotations_list_widget import compact_label_data
 import numpy as np
 
 # make_napari_viewer is a pytest fixture that returns a napari viewer object
@@ -13,6 +14,160 @@ def test_annotator_q_widget(make_napari_viewer, capsys):
     assert 1 == 1
 
 
+def test_compact_label_data():
+    data = np.array([[0, 5, 5], [9, 0, 300]], dtype=np.int64)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint16
+    assert mapping == {5: 1, 9: 2, 300: 3}
+    np.testing.assert_array_equal(compacted, [[0, 1, 1], [2, 0, 3]])
+
+    # sparse labels, not using the lookup table
+    data = np.array([[0, 2**40], [7, 2**40]], dtype=np.int64)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint16
+    assert mapping == {7: 1, 2**40: 2}
+    np.testing.assert_array_equal(compacted, [[0, 2], [1, 2]])
+
+    # negative labels, not using the lookup table
+    data = np.array([[0, -3], [5, -3]], dtype=np.int32)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint16
+    assert mapping == {-3: 1, 5: 2}
+    np.testing.assert_array_equal(compacted, [[0, 1], [2, 1]])
+
+    # only background
+    data = np.zeros((3, 3), dtype=np.int64)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint16
+    assert mapping == {}
+    np.testing.assert_array_equal(compacted, data)
+
+    # already compact, the data type is kept
+    data = np.array([[0, 1], [2, 2]], dtype=np.uint8)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint8
+    assert compacted.nbytes == data.nbytes
+    assert mapping == {1: 1, 2: 2}
+    np.testing.assert_array_equal(compacted, data)
+
+    # small signed data type, not widened
+    data = np.array([[0, -1], [3, 3]], dtype=np.int8)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint8
+    assert mapping == {-1: 1, 3: 2}
+    np.testing.assert_array_equal(compacted, [[0, 1], [2, 2]])
+
+    # 254 labels still leave room for a next label in uint8
+    data = np.arange(255, dtype=np.uint8)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint8
+    assert len(mapping) == 254
+
+    # 255 labels do not, N + 1 == 256 needs uint16
+    data = np.arange(256, dtype=np.uint8)
+    compacted, mapping = compact_label_data(data)
+    assert compacted.dtype == np.uint16
+    assert len(mapping) == 255
+    np.testing.assert_array_equal(compacted, data)
+
+
+def test_annotator_compact_labels(make_napari_viewer, capsys):
+    viewer = make_napari_viewer()
+    data = np.zeros((10, 10), dtype=np.int64)
+    data[1, 1] = 3
+    data[5, 5] = 8
+    layer = viewer.add_labels(data)
+    my_widget = Annotator(viewer)
+    anno_list = my_widget.widget_label_main
+    assert len(anno_list.label_items_array) == 8
+
+    # hide label 8 and give label 3 a custom color
+    anno_list.label_items_array[7].qVisible.setChecked(False)
+    anno_list.color_dict[3] = np.array([1.0, 0.0, 0.0, 1.0])
+    # select the next unused label
+    layer.selected_label = 9
+
+    saved = anno_list.compact_labels()
+    assert saved == data.nbytes - data.size * 2
+    assert layer.data.dtype == np.uint16
+    assert layer.data[1, 1] == 1
+    assert layer.data[5, 5] == 2
+    assert layer.selected_label == 3
+    assert len(anno_list.label_items_array) == 2
+    np.testing.assert_array_equal(
+        anno_list.color_dict[1], [1.0, 0.0, 0.0, 1.0]
+    )
+    assert anno_list.color_dict[2][3] == 0
+    assert not anno_list.label_items_array[1].qVisible.isChecked()
+    captured = capsys.readouterr()
+    assert "saved 0.6 KB" in captured.out
+
+
+def test_annotator_compact_sparse_labels(make_napari_viewer, capsys):
+    viewer = make_napari_viewer()
+    data = np.zeros((10, 10), dtype=np.int64)
+    data[1, 1] = 4
+    data[5, 5] = 25000
+    layer = viewer.add_labels(data)
+    layer.selected_label = 25000
+    my_widget = Annotator(viewer)
+    anno_list = my_widget.widget_label_main
+
+    anno_list.compact_labels()
+    assert layer.data[5, 5] == 2
+    assert layer.selected_label == 2
+    # label 25000 had no plugin color, it gets the default color
+    np.testing.assert_array_equal(
+        anno_list.color_dict[2], anno_list.default_colors[2]
+    )
+    assert anno_list.label_items_array[1].qVisible.isChecked()
+
+
+def test_annotator_compact_labels_nothing_saved(make_napari_viewer, capsys):
+    viewer = make_napari_viewer()
+    data = np.zeros((10, 10), dtype=np.uint8)
+    data[1, 1] = 1
+    data[5, 5] = 2
+    layer = viewer.add_labels(data)
+    my_widget = Annotator(viewer)
+
+    assert my_widget.widget_label_main.compact_labels() == 0
+    assert layer.data.dtype == np.uint8
+    captured = capsys.readouterr()
+    assert "saved 0.0 KB" in captured.out
+
+
+def test_annotator_compact_negative_labels(make_napari_viewer, capsys):
+    viewer = make_napari_viewer()
+    data = np.zeros((10, 10), dtype=np.int64)
+    data[0, :3] = [-5, -4, -3]
+    data[5, 5] = 1
+    data[6, 6] = 2
+    layer = viewer.add_labels(data)
+    my_widget = Annotator(viewer)
+    anno_list = my_widget.widget_label_main
+
+    # give label 1 a custom color and hide label 2
+    anno_list.color_dict[1] = np.array([1.0, 0.0, 0.0, 1.0])
+    anno_list.label_items_array[1].qVisible.setChecked(False)
+    # select the background
+    layer.selected_label = 0
+
+    anno_list.compact_labels()
+    assert layer.data[5, 5] == 4
+    assert layer.data[6, 6] == 5
+    assert layer.selected_label == 0
+    np.testing.assert_array_equal(
+        anno_list.color_dict[4], [1.0, 0.0, 0.0, 1.0]
+    )
+    assert anno_list.color_dict[5][3] == 0
+    assert not anno_list.label_items_array[4].qVisible.isChecked()
+    # the negative labels get default colors
+    np.testing.assert_array_equal(
+        anno_list.color_dict[1], anno_list.default_colors[1]
+    )
+
+
 '''
 # original file contents
 